@@ -1,3 +1,21 @@
+from html import escape
+
+
+def escape_text(value):
+    # Most values have nothing to escape, and the membership tests are much
+    # cheaper than running the replace chain in html.escape on every node.
+    if "&" in value or "<" in value or ">" in value:
+        return escape(value, quote=False)
+    return value
+
+
+def escape_attribute(value):
+    value = str(value)
+    if "&" in value or "<" in value or ">" in value or '"' in value or "'" in value:
+        return escape(value)
+    return value
+
+
 class HTMLNode: 
     def __init__(self, tag=None, value=None, children=None, props=None):
         self.tag = tag
@@ -11,11 +29,14 @@ class HTMLNode:
     def to_html(self):
         raise NotImplementedError("to_html() must be implemented by subclasses")
 
+    def iter_html(self, text_filter=None):
+        raise NotImplementedError("iter_html() must be implemented by subclasses")
+
     
     def props_to_html(self):
         if not self.props:
             return ""
-        return " " + " ".join(f'{key}="{value}"' for key, value in self.props.items())
+        return " " + " ".join([f'{key}="{escape_attribute(value)}"' for key, value in self.props.items()])
 
 
     def __repr__(self):
@@ -34,11 +55,26 @@ class LeafNode(HTMLNode):
         if self.value is None:
             raise ValueError("LeafNode must have a value to render.")
         
+        value = escape_text(self.value)
         if self.tag is None:
-            return self.value
+            return value
+
+        return f"<{self.tag}{self.props_to_html()}>{value}</{self.tag}>"
+
+    def iter_html(self, text_filter=None):
+        if self.value is None:
+            raise ValueError("LeafNode must have a value to render.")
+
+        value = self.value if text_filter is None else text_filter(self.value)
+        value = escape_text(value)
+        if self.tag is None:
+            yield value
+            return
+
+        yield f"<{self.tag}{self.props_to_html()}>"
+        yield value
+        yield f"</{self.tag}>"
 
-        return f"<{self.tag}{self.props_to_html()}>{self.value}</{self.tag}>"
-        
 class ParentNode(HTMLNode):
     def __init__(self, tag, children, props=None):
         if tag is None:
@@ -53,7 +89,22 @@ class ParentNode(HTMLNode):
         if self.children is None:
             raise ValueError("ParentNode must have children to render.")
         
-        inner_html = "".join(child.to_html() for child in self.children)
+        inner_html = "".join([child.to_html() for child in self.children])
         return f"<{self.tag}{self.props_to_html()}>{inner_html}</{self.tag}>"
 
+    def iter_html(self, text_filter=None):
+        if self.tag is None:
+            raise ValueError("ParentNode must have a tag to render.")
+        if self.children is None:
+            raise ValueError("ParentNode must have children to render.")
+
+        # Preformatted content is emitted exactly as written.
+        if self.tag == "pre":
+            text_filter = None
+
+        yield f"<{self.tag}{self.props_to_html()}>"
+        for child in self.children:
+            yield from child.iter_html(text_filter)
+        yield f"</{self.tag}>"
+
 
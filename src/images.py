@@ -0,0 +1,283 @@
+import os
+import json
+import zlib
+import struct
+import shutil
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+VARIANT_WIDTHS = (480, 960)
+
+# Samples per pixel for each PNG colour type at 8 bits per sample.
+_CHANNELS = {0: 1, 2: 3, 3: 3, 4: 2, 6: 4}
+
+
+def read_png_size(data):
+    if data[:8] != PNG_SIGNATURE or data[12:16] != b"IHDR":
+        raise ValueError("Not a PNG image")
+    if len(data) < 29:
+        raise ValueError("Truncated PNG header")
+    return struct.unpack(">II", data[16:24])
+
+
+def _read_chunks(data):
+    pos = 8
+    while pos < len(data):
+        length, chunk_type = struct.unpack(">I4s", data[pos:pos + 8])
+        yield chunk_type, data[pos + 8:pos + 8 + length]
+        pos += length + 12
+
+
+def _paeth(a, b, c):
+    p = a + b - c
+    pa, pb, pc = abs(p - a), abs(p - b), abs(p - c)
+    if pa <= pb and pa <= pc:
+        return a
+    if pb <= pc:
+        return b
+    return c
+
+
+def _unfilter(raw, width, height, bpp):
+    stride = width * bpp
+    pixels = bytearray(stride * height)
+    prev = bytearray(stride)
+    pos = 0
+    for y in range(height):
+        filter_type = raw[pos]
+        row = bytearray(raw[pos + 1:pos + 1 + stride])
+        pos += stride + 1
+        if filter_type == 1:
+            for i in range(bpp, stride):
+                row[i] = (row[i] + row[i - bpp]) & 0xFF
+        elif filter_type == 2:
+            for i in range(stride):
+                row[i] = (row[i] + prev[i]) & 0xFF
+        elif filter_type == 3:
+            for i in range(stride):
+                left = row[i - bpp] if i >= bpp else 0
+                row[i] = (row[i] + ((left + prev[i]) >> 1)) & 0xFF
+        elif filter_type == 4:
+            for i in range(stride):
+                left = row[i - bpp] if i >= bpp else 0
+                up_left = prev[i - bpp] if i >= bpp else 0
+                row[i] = (row[i] + _paeth(left, prev[i], up_left)) & 0xFF
+        elif filter_type != 0:
+            raise ValueError(f"Unknown PNG filter type: {filter_type}")
+        pixels[y * stride:(y + 1) * stride] = row
+        prev = row
+    return pixels
+
+
+def decode_png(data):
+    try:
+        return _decode_png(data)
+    except (struct.error, zlib.error, IndexError) as e:
+        # Truncated chunks, corrupt IDAT streams and short scanlines all mean
+        # the same thing to callers: this file cannot be decoded.
+        raise ValueError(f"Malformed PNG: {e}") from e
+
+
+def _decode_png(data):
+    width, height = read_png_size(data)
+    bit_depth, color_type, _, _, interlace = struct.unpack(">BBBBB", data[24:29])
+    if bit_depth != 8 or interlace != 0 or color_type not in _CHANNELS:
+        raise ValueError("Only 8-bit, non-interlaced PNG images are supported")
+
+    palette = transparency = None
+    idat = []
+    for chunk_type, body in _read_chunks(data):
+        if chunk_type == b"PLTE":
+            palette = body
+        elif chunk_type == b"tRNS":
+            transparency = body
+        elif chunk_type == b"IDAT":
+            idat.append(body)
+
+    if color_type == 3:
+        if palette is None:
+            raise ValueError("Palette PNG without PLTE")
+        # Palette images are expanded so they can be averaged like RGB(A).
+        indexes = _unfilter(zlib.decompress(b"".join(idat)), width, height, 1)
+        if transparency:
+            alpha = transparency + b"\xff" * (256 - len(transparency))
+            lookup = [palette[i * 3:i * 3 + 3] + alpha[i:i + 1] for i in range(len(palette) // 3)]
+            return width, height, 4, bytearray(b"".join(lookup[i] for i in indexes))
+        lookup = [palette[i * 3:i * 3 + 3] for i in range(len(palette) // 3)]
+        return width, height, 3, bytearray(b"".join(lookup[i] for i in indexes))
+
+    channels = _CHANNELS[color_type]
+    pixels = _unfilter(zlib.decompress(b"".join(idat)), width, height, channels)
+    return width, height, channels, pixels
+
+
+def _chunk(chunk_type, body):
+    checksum = zlib.crc32(chunk_type + body) & 0xFFFFFFFF
+    return struct.pack(">I", len(body)) + chunk_type + body + struct.pack(">I", checksum)
+
+
+def encode_png(width, height, channels, pixels):
+    color_type = {1: 0, 2: 4, 3: 2, 4: 6}[channels]
+    stride = width * channels
+    rows = [b"\x00" + bytes(pixels[:stride])]
+    for y in range(1, height):
+        row = pixels[y * stride:(y + 1) * stride]
+        prev = pixels[(y - 1) * stride:y * stride]
+        # The "up" filter is cheap to compute and compresses photos well enough.
+        rows.append(b"\x02" + bytes((a - b) & 0xFF for a, b in zip(row, prev)))
+    header = struct.pack(">IIBBBBB", width, height, 8, color_type, 0, 0, 0)
+    return (
+        PNG_SIGNATURE
+        + _chunk(b"IHDR", header)
+        + _chunk(b"IDAT", zlib.compress(b"".join(rows), 9))
+        + _chunk(b"IEND", b"")
+    )
+
+
+def downscale(width, height, channels, pixels, new_width):
+    new_height = max(1, round(height * new_width / width))
+    stride = width * channels
+    columns = [(dx * width // new_width, max(dx * width // new_width + 1, (dx + 1) * width // new_width))
+               for dx in range(new_width)]
+    out = bytearray(new_width * new_height * channels)
+    pos = 0
+    for dy in range(new_height):
+        y0 = dy * height // new_height
+        y1 = max(y0 + 1, (dy + 1) * height // new_height)
+        rows = [pixels[y * stride:(y + 1) * stride] for y in range(y0, y1)]
+        for x0, x1 in columns:
+            count = (x1 - x0) * (y1 - y0)
+            for c in range(channels):
+                total = 0
+                for row in rows:
+                    total += sum(row[x0 * channels + c:x1 * channels:channels])
+                out[pos] = total // count
+                pos += 1
+    return new_width, new_height, out
+
+
+def build_variants(source_path, targets):
+    with open(source_path, "rb") as f:
+        width, height, channels, pixels = decode_png(f.read())
+    for new_width, cache_path in targets:
+        scaled_width, scaled_height, scaled = downscale(width, height, channels, pixels, new_width)
+        with open(cache_path, "wb") as f:
+            f.write(encode_png(scaled_width, scaled_height, channels, scaled))
+    return source_path
+
+
+def variant_name(rel_path, width):
+    stem, ext = os.path.splitext(rel_path)
+    return f"{stem}-{width}w{ext}"
+
+
+class ImageStage:
+    def __init__(self, cache_dir, widths=VARIANT_WIDTHS, workers=None):
+        self.cache_dir = cache_dir
+        self.widths = widths
+        self.workers = workers
+        self.index_path = os.path.join(cache_dir, "images.json")
+        self.images = {}
+        self.sources = {}
+        self.variants_built = 0
+
+    def _load_index(self):
+        if not os.path.exists(self.index_path):
+            return {}
+        with open(self.index_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def _save_index(self, index):
+        with open(self.index_path, "w", encoding="utf-8") as f:
+            json.dump(index, f, indent=2, sort_keys=True)
+
+    def prepare(self, static_dir, public_dir, basepath="/"):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        index = self._load_index()
+        pending = []
+        found = []
+
+        # Walk the sources, not the output: an output directory kept between
+        # builds already holds variants, which must not get variants of their own.
+        for root, _, files in os.walk(static_dir):
+            for filename in files:
+                if not filename.lower().endswith(".png"):
+                    continue
+                path = os.path.join(root, filename)
+                with open(path, "rb") as f:
+                    data = f.read()
+                digest = hashlib.sha256(data).hexdigest()
+                if digest not in index:
+                    try:
+                        width, height = read_png_size(data)
+                    except ValueError:
+                        continue
+                    index[digest] = {"width": width, "height": height}
+                width = index[digest]["width"]
+
+                rel_path = os.path.relpath(path, static_dir)
+                variants = []
+                missing = []
+                # Images that failed to decode once are not retried each build.
+                targets = () if index[digest].get("unsupported") else self.widths
+                for target in targets:
+                    if target >= width:
+                        continue
+                    cache_path = os.path.join(self.cache_dir, f"{digest}-{target}.png")
+                    variants.append((target, cache_path))
+                    if not os.path.exists(cache_path):
+                        missing.append((target, cache_path))
+                if missing:
+                    pending.append((digest, path, missing))
+                found.append((rel_path, digest, variants))
+
+        if pending:
+            with ProcessPoolExecutor(max_workers=self.workers) as pool:
+                futures = {
+                    pool.submit(build_variants, path, missing): (digest, path, missing)
+                    for digest, path, missing in pending
+                }
+                for future, (digest, path, missing) in futures.items():
+                    try:
+                        future.result()
+                    except ValueError as e:
+                        print(f"Skipping variants for {path}: {e}")
+                        index[digest]["unsupported"] = True
+                        continue
+                    self.variants_built += len(missing)
+        self._save_index(index)
+
+        basepath = basepath.rstrip("/")
+        for rel_path, digest, variants in found:
+            url = "/" + rel_path.replace(os.sep, "/")
+            info = {"width": index[digest]["width"], "height": index[digest]["height"]}
+            self.images[url] = info
+            self.sources[url] = os.path.join(static_dir, rel_path)
+            if not variants or index[digest].get("unsupported"):
+                continue
+            # srcset is not covered by the basepath rewrite in generate_page.
+            srcset = []
+            for target, cache_path in variants:
+                variant_rel = variant_name(rel_path, target)
+                shutil.copyfile(cache_path, os.path.join(public_dir, variant_rel))
+                srcset.append(f"{basepath}/{variant_rel.replace(os.sep, '/')} {target}w")
+            srcset.append(f"{basepath}{url} {info['width']}w")
+            info["srcset"] = ", ".join(srcset)
+
+    def annotate(self, node, used=None):
+        # Returns the source files of the images found, for dependency tracking.
+        if used is None:
+            used = set()
+        if node.tag == "img" and node.props:
+            src = node.props.get("src")
+            info = self.images.get(src)
+            if info is not None:
+                used.add(self.sources[src])
+                node.props["width"] = info["width"]
+                node.props["height"] = info["height"]
+                if "srcset" in info:
+                    node.props["srcset"] = info["srcset"]
+        for child in node.children or ():
+            self.annotate(child, used)
+        return used
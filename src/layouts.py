@@ -0,0 +1,75 @@
+import os
+import re
+from minify import Minifier, utf8_length
+
+_PLACEHOLDER = re.compile(r"\{\{\s*(\w+)\s*\}\}")
+
+
+class Layout:
+    def __init__(self, path, source, minify=False):
+        self.path = path
+        self.source_length = utf8_length(source)
+        self.minify_seconds = 0.0
+        if minify:
+            minifier = Minifier()
+            source = minifier.template(source)
+            self.minify_seconds = minifier.seconds
+        self.length = utf8_length(source)
+
+        # Compiled form: literal text alternating with placeholder names, so
+        # rendering is a single join instead of a replace() per placeholder.
+        pieces = _PLACEHOLDER.split(source)
+        self.literals = pieces[0::2]
+        self.names = pieces[1::2]
+        self.placeholders = [match.group(0) for match in _PLACEHOLDER.finditer(source)]
+
+    def render(self, values):
+        parts = [self.literals[0]]
+        for name, placeholder, literal in zip(self.names, self.placeholders, self.literals[1:]):
+            # Unknown placeholders are left in the output untouched.
+            parts.append(values.get(name, placeholder))
+            parts.append(literal)
+        return "".join(parts)
+
+
+class LayoutCache:
+    def __init__(self, default_path, layouts_dir=None, content_dir=None):
+        self.default_path = default_path
+        self.layouts_dir = layouts_dir
+        self.content_dir = content_dir
+        self.loads = 0
+        self._compiled = {}
+
+    def resolve(self, source_path, front_matter):
+        # Returns the layout path and the more specific candidates that were
+        # looked for and missing, so callers can notice when one appears.
+        if "layout" in front_matter:
+            if self.layouts_dir is None:
+                raise ValueError(f"{source_path} asks for layout {front_matter['layout']!r} but no layouts directory is set")
+            path = os.path.join(self.layouts_dir, front_matter["layout"] + ".html")
+            if not os.path.exists(path):
+                raise ValueError(f"Layout not found for {source_path}: {path}")
+            return path, []
+
+        # Otherwise the closest section layout wins: content/blog/tom/index.md
+        # tries layouts/blog/tom.html, then layouts/blog.html.
+        missing = []
+        if self.layouts_dir is not None and self.content_dir is not None:
+            rel_dir = os.path.dirname(os.path.relpath(source_path, self.content_dir))
+            while rel_dir and not rel_dir.startswith(".."):
+                path = os.path.join(self.layouts_dir, rel_dir + ".html")
+                if os.path.exists(path):
+                    return path, missing
+                missing.append(path)
+                rel_dir = os.path.dirname(rel_dir)
+        return self.default_path, missing
+
+    def get(self, path, minify=False):
+        key = (path, os.stat(path).st_mtime_ns, minify)
+        layout = self._compiled.get(key)
+        if layout is None:
+            with open(path, "r", encoding="utf-8") as f:
+                layout = Layout(path, f.read(), minify)
+            self._compiled[key] = layout
+            self.loads += 1
+        return layout
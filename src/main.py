@@ -1,9 +1,16 @@
 import os
-import sys
+import time
 import shutil
+import argparse
 from textnode import TextNode, TextType
-from htmlnode import LeafNode
-from parser import markdown_to_html_node
+from htmlnode import LeafNode, ParentNode, escape_text, escape_attribute
+from parser import markdown_to_document, split_markdown_pages, split_front_matter, extract_title
+from minify import Minifier
+from summary import BuildSummary
+from images import ImageStage
+from memprofile import MemoryProfiler, profile_stage
+from layouts import LayoutCache
+from manifest import BuildManifest
 
 
 
@@ -17,49 +24,131 @@ def clean_copy_dir(src, dst):
     shutil.copytree(src, dst)
     print(f"Copied {src} to {dst}")
 
-def extract_title(markdown):
-    for line in markdown.splitlines():
-        stripped = line.strip()
-        if stripped.startswith("# ") and not stripped.startswith("##"):
-            return stripped[2:].strip()
-        elif stripped.startswith("#") and not stripped.startswith("##"):
-            return stripped[1:].strip()
-    raise ValueError("No H1 header found in the markdown.")
-
-def generate_page(from_path, template_path, dest_path, basepath):
-    print(f"Generating page from {from_path} to {dest_path} using {template_path}")
+def paginated_path(path, page_number):
+    if page_number == 1:
+        return path
+    stem, ext = os.path.splitext(path)
+    return f"{stem}-{page_number}{ext}"
+
+def pagination_node(page_urls, index):
+    children = []
+    if index > 0:
+        children.append(LeafNode("a", "Previous", {"href": page_urls[index - 1], "rel": "prev"}))
+    children.append(LeafNode("span", f"Page {index + 1} of {len(page_urls)}"))
+    if index < len(page_urls) - 1:
+        children.append(LeafNode("a", "Next", {"href": page_urls[index + 1], "rel": "next"}))
+    return ParentNode("nav", children, {"class": "pagination"})
+
+def generate_page(from_path, template_path, dest_path, basepath, *, minify=False, summary=None,
+                  max_page_chars=None, images=None, profiler=None, layouts=None, manifest=None):
+    if summary is None:
+        summary = BuildSummary()
+    if layouts is None:
+        layouts = LayoutCache(template_path)
 
     with open(from_path, "r", encoding="utf-8") as f:
         markdown_content = f.read()
-    
-    with open(template_path, "r", encoding="utf-8") as f:
-        template_content = f.read()
-    
-    html_node = markdown_to_html_node(markdown_content)
-    html_content = html_node.to_html()
-    title = extract_title(markdown_content)
-    full_html = template_content.replace("{{ Title }}", title).replace("{{ Content }}", html_content)
-    
+    front_matter, markdown_content = split_front_matter(markdown_content)
+
+    layout_path, missing_layouts = layouts.resolve(from_path, front_matter)
+    print(f"Generating page from {from_path} to {dest_path} using {layout_path}")
+    layout = layouts.get(layout_path, minify)
+    if minify:
+        summary.add_layout_minify(layout)
+
     if basepath.endswith("/"):
         basepath = basepath[:-1]
-    
-    full_html = full_html.replace('href="/', f'href="{basepath}/')
-    full_html = full_html.replace('src="/', f'src="{basepath}/')
-    
-    os.makedirs(os.path.dirname(dest_path), exist_ok=True)
-    with open(dest_path, "w", encoding="utf-8") as f:
-        f.write(full_html)
 
-def generate_pages_recursive(dir_path_content, template_path, dest_dir_path, basepath):
+    if max_page_chars:
+        chunks = split_markdown_pages(markdown_content, max_page_chars)
+    else:
+        chunks = [markdown_content]
+    page_paths = [paginated_path(dest_path, number) for number in range(1, len(chunks) + 1)]
+    # Pages of one document share a directory, so plain file names link them.
+    page_urls = [os.path.basename(path) for path in page_paths]
+
+    # Chunks are parsed and rendered one at a time so only a single page's
+    # tree and HTML are alive at once.
+    title = front_matter.get("title")
+    image_sources = set()
+    for index, chunk in enumerate(chunks):
+        page_path = page_paths[index]
+
+        # Timers sit inside the profiled blocks so snapshot cost is not
+        # reported as parse or render time.
+        with profile_stage(profiler, page_path, "parse"):
+            start = time.perf_counter()
+            html_node, metadata = markdown_to_document(chunk)
+            if images is not None:
+                images.annotate(html_node, image_sources)
+            parse_seconds = time.perf_counter() - start
+        if title is None:
+            # An H1 after a long intro can land in a later chunk, so the
+            # fallback scans the whole document rather than this page.
+            title = extract_title(markdown_content, metadata)
+        summary.add_stage_time("parse", parse_seconds)
+
+        page_title = title
+        if len(chunks) > 1:
+            html_node.children.append(pagination_node(page_urls, index))
+            if index > 0:
+                page_title = f"{title} (page {index + 1})"
+
+        with profile_stage(profiler, page_path, "render"):
+            start = time.perf_counter()
+            if minify:
+                minifier = Minifier()
+                minifier.count(layout.source_length, layout.length)
+                html_content = minifier.render(html_node)
+            else:
+                html_content = html_node.to_html()
+            render_seconds = time.perf_counter() - start
+        summary.add_stage_time("render", render_seconds)
+        if minify:
+            summary.add_minify(minifier)
+
+        with profile_stage(profiler, page_path, "assemble"):
+            values = {key: escape_attribute(value) for key, value in front_matter.items()}
+            values["Title"] = escape_text(page_title)
+            values["Content"] = html_content
+            full_html = layout.render(values)
+
+            full_html = full_html.replace('href="/', f'href="{basepath}/')
+            full_html = full_html.replace('src="/', f'src="{basepath}/')
+
+        os.makedirs(os.path.dirname(page_path), exist_ok=True)
+        with open(page_path, "w", encoding="utf-8") as f:
+            f.write(full_html)
+
+        summary.pages += 1
+        summary.bytes_written += len(full_html.encode("utf-8"))
+
+    if manifest is not None:
+        dependencies = [from_path, layout_path] + sorted(image_sources)
+        manifest.record(from_path, dependencies, page_paths, absent=missing_layouts)
+    return layout_path, page_paths
+
+def generate_pages_recursive(dir_path_content, template_path, dest_dir_path, basepath, *, minify=False, summary=None,
+                             max_page_chars=None, images=None, profiler=None, layouts=None, manifest=None):
+    if layouts is None:
+        layouts = LayoutCache(template_path)
     for root, _, files in os.walk(dir_path_content):
         for filename in files:
             if filename.endswith(".md"):
                 from_path = os.path.join(root, filename)
+                if manifest is not None and manifest.is_fresh(from_path):
+                    if summary is not None:
+                        summary.pages_skipped += 1
+                    continue
                 rel_path = os.path.relpath(from_path, dir_path_content)
                 rel_html_path = os.path.splitext(rel_path)[0] + ".html"
                 dest_path = os.path.join(dest_dir_path, rel_html_path)
                 os.makedirs(os.path.dirname(dest_path), exist_ok=True)
-                generate_page(from_path, template_path, dest_path, basepath)
+                generate_page(
+                    from_path, template_path, dest_path, basepath,
+                    minify=minify, summary=summary, max_page_chars=max_page_chars,
+                    images=images, profiler=profiler, layouts=layouts, manifest=manifest,
+                )
 
 
 
@@ -68,19 +157,67 @@ def main():
     static_dir = "static"
     content_dir = "content"
     template_file = "template.html"
-
-
-    basepath = sys.argv[1] if len(sys.argv) > 1 else "/"
+    layouts_dir = "layouts"
+    cache_dir = ".build_cache"
+
+
+    arg_parser = argparse.ArgumentParser(description="Build the static site.")
+    arg_parser.add_argument("basepath", nargs="?", default="/")
+    arg_parser.add_argument("--minify", action="store_true", help="collapse whitespace in generated HTML")
+    arg_parser.add_argument("--paginate", type=int, metavar="CHARS",
+                            help="split pages longer than CHARS characters of markdown at headings")
+    arg_parser.add_argument("--images", action="store_true",
+                            help="add image dimensions and build downscaled srcset variants")
+    arg_parser.add_argument("--memprofile", nargs="?", const="memprofile.json", metavar="PATH",
+                            help="write per-page, per-stage allocation report (default: memprofile.json)")
+    arg_parser.add_argument("--incremental", action="store_true",
+                            help="keep the output directory and only rebuild pages whose inputs changed")
+    args = arg_parser.parse_args()
+
+    basepath = args.basepath
     print(f"Using basepath: {basepath}")
 
-    if os.path.exists(public_dir):
+    if os.path.exists(public_dir) and not args.incremental:
         shutil.rmtree(public_dir)
         print(f"Deleted existing directory: {public_dir}")
     
-    shutil.copytree(static_dir, public_dir)
+    shutil.copytree(static_dir, public_dir, dirs_exist_ok=True)
     print(f"Copied {static_dir} to {public_dir}")
 
-    generate_pages_recursive(content_dir, template_file, public_dir, basepath)
+    summary = BuildSummary()
+    images = None
+    if args.images:
+        images = ImageStage(cache_dir)
+        start = time.perf_counter()
+        images.prepare(static_dir, public_dir, basepath)
+        summary.add_stage_time("images", time.perf_counter() - start)
+        print(f"Built {images.variants_built} image variant(s)")
+
+    profiler = None
+    if args.memprofile:
+        profiler = MemoryProfiler()
+        profiler.start()
+        summary.profiled = True
+
+    layouts = LayoutCache(template_file, layouts_dir, content_dir)
+    options = {"basepath": basepath, "minify": args.minify, "paginate": args.paginate, "images": args.images}
+    manifest = BuildManifest(os.path.join(cache_dir, "pages.json"), options, reuse=args.incremental)
+
+    generate_pages_recursive(
+        content_dir, template_file, public_dir, basepath,
+        minify=args.minify, summary=summary, max_page_chars=args.paginate,
+        images=images, profiler=profiler, layouts=layouts, manifest=manifest,
+    )
+    for output in manifest.remove_stale_outputs():
+        print(f"Removed stale output: {output}")
+    manifest.save()
+    summary.layouts_loaded = layouts.loads
+    print(summary.report())
+
+    if profiler is not None:
+        profiler.stop()
+        profiler.write(args.memprofile)
+        print(f"Wrote memory profile to {args.memprofile}")
 
 
 
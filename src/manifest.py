@@ -0,0 +1,61 @@
+import os
+import json
+
+
+class BuildManifest:
+    def __init__(self, path, options, reuse=True):
+        self.path = path
+        self.options = options
+        self.pages = {}
+        self.previous = {}
+        self.previous_outputs = set()
+        if reuse and os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            for entry in data.get("pages", {}).values():
+                self.previous_outputs.update(entry["outputs"])
+            # Pages built with different options are all out of date.
+            if data.get("options") == options:
+                self.previous = data.get("pages", {})
+
+    def is_fresh(self, source_path):
+        entry = self.previous.get(source_path)
+        if entry is None:
+            return False
+        for dependency, mtime in entry["dependencies"].items():
+            # A None mtime records a path that was looked for and not found,
+            # such as a more specific section layout; its appearance is a change.
+            if mtime is None:
+                if os.path.exists(dependency):
+                    return False
+            elif not os.path.exists(dependency) or os.stat(dependency).st_mtime_ns != mtime:
+                return False
+        if not all(os.path.exists(output) for output in entry["outputs"]):
+            return False
+        self.pages[source_path] = entry
+        return True
+
+    def record(self, source_path, dependencies, outputs, absent=()):
+        recorded = {path: os.stat(path).st_mtime_ns for path in dependencies}
+        recorded.update((path, None) for path in absent)
+        self.pages[source_path] = {"dependencies": recorded, "outputs": outputs}
+
+    def stale_outputs(self):
+        current = set()
+        for entry in self.pages.values():
+            current.update(entry["outputs"])
+        return sorted(self.previous_outputs - current)
+
+    def remove_stale_outputs(self):
+        removed = []
+        for output in self.stale_outputs():
+            if os.path.exists(output):
+                os.remove(output)
+                removed.append(output)
+        return removed
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump({"options": self.options, "pages": self.pages}, f, indent=2, sort_keys=True)
+            f.write("\n")
@@ -0,0 +1,79 @@
+import os
+import json
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+
+TOP_SITES = 10
+
+_IGNORED = (
+    tracemalloc.Filter(False, __file__),
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+
+def _site(frame):
+    filename = frame.filename
+    if os.path.isabs(filename) and filename.startswith(os.getcwd()):
+        filename = os.path.relpath(filename)
+    return f"{filename}:{frame.lineno}"
+
+
+class MemoryProfiler:
+    def __init__(self, top=TOP_SITES):
+        self.top = top
+        self.pages = {}
+
+    def start(self):
+        tracemalloc.start()
+
+    def stop(self):
+        tracemalloc.stop()
+
+    def _snapshot(self):
+        return tracemalloc.take_snapshot().filter_traces(_IGNORED)
+
+    @contextmanager
+    def stage(self, page, name):
+        entry = self.pages.setdefault(page, {"peak_bytes": 0, "stages": {}})
+        before = self._snapshot()
+        current_before, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        try:
+            yield
+        finally:
+            current_after, peak = tracemalloc.get_traced_memory()
+            after = self._snapshot()
+            stats = after.compare_to(before, "lineno")
+            # Stages of a page run back to back, so the page peak is the
+            # highest stage peak above what was live before it started.
+            stage_peak = peak - current_before
+            entry["peak_bytes"] = max(entry["peak_bytes"], stage_peak)
+            entry["stages"][name] = {
+                "peak_bytes": stage_peak,
+                "retained_bytes": current_after - current_before,
+                "top_sites": [
+                    {
+                        "site": _site(stat.traceback[0]),
+                        "size_diff": stat.size_diff,
+                        "count_diff": stat.count_diff,
+                    }
+                    for stat in stats[:self.top]
+                ],
+            }
+
+    def report(self):
+        return {"pages": self.pages}
+
+    def write(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.report(), f, indent=2)
+            f.write("\n")
+
+
+def profile_stage(profiler, page, name):
+    if profiler is None:
+        return nullcontext()
+    return profiler.stage(page, name)
@@ -0,0 +1,46 @@
+import re
+import time
+
+# Only the ASCII whitespace HTML collapses; non-breaking spaces must survive.
+_WHITESPACE_RUN = re.compile(r"[ \t\r\n\f]+")
+# Raw-text and preformatted elements are kept verbatim: joining lines inside
+# a <script> would pull the code after a // comment into the comment.
+_TEMPLATE_TOKEN = re.compile(
+    r"(<(pre|textarea|script|style)\b.*?</\2\s*>)|[ \t\r\n\f]+",
+    re.DOTALL | re.IGNORECASE,
+)
+
+
+def utf8_length(value):
+    # Sizes are reported next to bytes_written, so count encoded bytes.
+    return len(value) if value.isascii() else len(value.encode("utf-8"))
+
+
+class Minifier:
+    def __init__(self):
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.seconds = 0.0
+
+    def count(self, bytes_in, bytes_out):
+        self.bytes_in += bytes_in
+        self.bytes_out += bytes_out
+
+    def text(self, value):
+        start = time.perf_counter()
+        minified = _WHITESPACE_RUN.sub(" ", value)
+        self.seconds += time.perf_counter() - start
+        self.count(utf8_length(value), utf8_length(minified))
+        return minified
+
+    def template(self, template):
+        start = time.perf_counter()
+        # Runs collapse to one space rather than vanishing, so inline siblings
+        # keep their separation; protected blocks are put back as matched.
+        minified = _TEMPLATE_TOKEN.sub(lambda match: match.group(1) or " ", template).strip()
+        self.seconds += time.perf_counter() - start
+        self.count(utf8_length(template), utf8_length(minified))
+        return minified
+
+    def render(self, node):
+        return "".join(node.iter_html(self.text))
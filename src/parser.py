@@ -123,6 +123,23 @@ def text_to_textnodes(text):
     nodes = split_nodes_link(nodes)
     return nodes
 
+def split_front_matter(markdown):
+    if not markdown.startswith("---\n"):
+        return {}, markdown
+    end = markdown.find("\n---\n", 3)
+    if end == -1:
+        return {}, markdown
+
+    front_matter = {}
+    for line in markdown[4:end].splitlines():
+        if not line.strip():
+            continue
+        key, separator, value = line.partition(":")
+        if not separator:
+            raise ValueError(f"Invalid front matter line: {line}")
+        front_matter[key.strip()] = value.strip().strip("\"'")
+    return front_matter, markdown[end + 5:]
+
 def markdown_to_blocks(markdown):
     blocks = markdown.split("\n\n")
     cleaned_blocks = [block.strip() for block in blocks if block.strip()]
@@ -168,21 +185,42 @@ def block_to_block_type(block: str) -> BlockType:
             return BlockType.ORDERED_LIST
     return BlockType.PARAGRAPH
 
-def text_to_children(text):
+class DocumentMetadata:
+    def __init__(self, title=None, outline=None, word_count=0):
+        self.title = title
+        self.outline = outline if outline is not None else []
+        self.word_count = word_count
+
+    def __repr__(self):
+        return (
+            f"DocumentMetadata(title={self.title!r}, outline={self.outline!r}, "
+            f"word_count={self.word_count!r})"
+        )
+
+def text_to_children(text, metadata=None):
     text_nodes = text_to_textnodes(text)
+    if metadata is not None:
+        metadata.word_count += sum(
+            len(tn.text.split()) for tn in text_nodes if tn.text_type != TextType.IMAGE
+        )
     html_nodes = [node for node in (text_node_to_html_node(tn) for tn in text_nodes) if node is not None]
     return html_nodes
 
 def markdown_to_html_node(markdown):
+    html_node, _ = markdown_to_document(markdown)
+    return html_node
+
+def markdown_to_document(markdown):
     blocks = markdown_to_blocks(markdown)
     parent = ParentNode("div", children=[])
+    metadata = DocumentMetadata()
 
     for block in blocks:
         block_type = block_to_block_type(block)
 
         if block_type == BlockType.PARAGRAPH:
             block_node = ParentNode("p", children=[])
-            children = text_to_children(block)
+            children = text_to_children(block, metadata)
             block_node.children.extend(children)
 
         elif block_type == BlockType.HEADING:
@@ -190,9 +228,14 @@ def markdown_to_html_node(markdown):
             tag = f"h{heading_level}"
             text = block[heading_level + 1:]
             block_node = ParentNode(tag, children=[])
-            children = text_to_children(text)
+            children = text_to_children(text, metadata)
             block_node.children.extend(children)
 
+            heading_text = "".join(child.value for child in children).strip()
+            metadata.outline.append((heading_level, heading_text))
+            if heading_level == 1 and metadata.title is None:
+                metadata.title = heading_text
+
         elif block_type == BlockType.CODE:
             code_lines = block.splitlines()[1:-1]
             code_text = "\n".join(code_lines)
@@ -206,7 +249,7 @@ def markdown_to_html_node(markdown):
             block_node = ParentNode("blockquote", children=[])
             lines = [line[1:].lstrip() for line in block.splitlines()]
             text = "\n".join(lines)
-            children = text_to_children(text)
+            children = text_to_children(text, metadata)
             block_node.children.extend(children)
 
         elif block_type == BlockType.UNORDERED_LIST:
@@ -214,7 +257,7 @@ def markdown_to_html_node(markdown):
             for line in block.splitlines():
                 item_text = line[2:].strip()  # remove '- '
                 li_node = ParentNode("li", children=[])
-                children = text_to_children(item_text)
+                children = text_to_children(item_text, metadata)
                 li_node.children.extend(children)
                 block_node.children.append(li_node)
 
@@ -223,18 +266,42 @@ def markdown_to_html_node(markdown):
             for line in block.splitlines():
                 item_text = line[line.find(".") + 1:].strip()
                 li_node = ParentNode("li", children=[])
-                children = text_to_children(item_text)
+                children = text_to_children(item_text, metadata)
                 li_node.children.extend(children)
                 block_node.children.append(li_node)
 
         else:
             block_node = ParentNode("p", children=[])
-            children = text_to_children(block)
+            children = text_to_children(block, metadata)
             block_node.children.extend(children)
 
         parent.children.append(block_node)
 
-    return parent
-
-
-
+    return parent, metadata
+
+def extract_title(markdown, metadata=None):
+    # Only rescan the lines when the parse pass found no H1 heading block.
+    if metadata is not None and metadata.title is not None:
+        return metadata.title
+    for line in markdown.splitlines():
+        stripped = line.strip()
+        if stripped.startswith("# ") and not stripped.startswith("##"):
+            return stripped[2:].strip()
+        elif stripped.startswith("#") and not stripped.startswith("##"):
+            return stripped[1:].strip()
+    raise ValueError("No H1 header found in the markdown.")
+
+def split_markdown_pages(markdown, max_chars):
+    pages = []
+    current = []
+    current_size = 0
+    for block in markdown_to_blocks(markdown):
+        if current and current_size >= max_chars and block_to_block_type(block) == BlockType.HEADING:
+            pages.append("\n\n".join(current))
+            current = []
+            current_size = 0
+        current.append(block)
+        current_size += len(block)
+    if current:
+        pages.append("\n\n".join(current))
+    return pages
@@ -0,0 +1,137 @@
+import os
+import sys
+import json
+import timeit
+import argparse
+import re
+import statistics
+from parser import markdown_to_blocks, text_to_textnodes, markdown_to_html_node, markdown_to_document
+from minify import Minifier
+
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "perf_baseline.json")
+DEFAULT_TOLERANCE = 2.0
+
+
+def build_corpus(sections=200):
+    # A fixed synthetic document touching every block and inline type, so the
+    # numbers do not drift when the site content changes.
+    parts = ["# Performance corpus"]
+    for i in range(sections):
+        parts.append(f"## Section {i}")
+        parts.append(
+            f"Paragraph {i} has **bold**, _italic_ and `code` spans, a [link](/page/{i}) "
+            f"and an ![image](/images/{i}.png).\nIt continues on a second line & ends."
+        )
+        parts.append(f"> Quoted line {i}\n> carries on here")
+        parts.append("- first item\n- second **item**\n- third _item_")
+        parts.append("1. one\n2. two\n3. three")
+        parts.append(f"```\ndef section_{i}():\n    return {i} < {i + 1}\n```")
+    return "\n\n".join(parts)
+
+
+_CALIBRATION_TEXT = "Some **bold** words and a [link](/x) in a line of text\n" * 200
+_CALIBRATION_PATTERN = re.compile(r"\[([^\[\]]*)\]\(([^\(\)]*)\)")
+
+
+class _CalibrationNode:
+    def __init__(self, text):
+        self.text = text
+
+
+def calibrate():
+    # Reference workload with the same mix of string, regex and object churn as
+    # the parser. Timings are stored relative to it so a baseline recorded on
+    # one machine is usable on another.
+    nodes = []
+    for line in _CALIBRATION_TEXT.splitlines():
+        for word in line.split(" "):
+            nodes.append(_CalibrationNode(word.strip("*")))
+        nodes.extend(_CalibrationNode(match.group(1)) for match in _CALIBRATION_PATTERN.finditer(line))
+    return "".join(f"<span>{node.text}</span>" for node in nodes)
+
+
+def benchmarks(corpus):
+    html_node = markdown_to_html_node(corpus)
+    paragraph = markdown_to_blocks(corpus)[2]
+    return {
+        "markdown_to_blocks": lambda: markdown_to_blocks(corpus),
+        "text_to_textnodes": lambda: text_to_textnodes(paragraph),
+        "markdown_to_html_node": lambda: markdown_to_html_node(corpus),
+        "markdown_to_document": lambda: markdown_to_document(corpus),
+        "to_html": html_node.to_html,
+        "minify_render": lambda: Minifier().render(html_node),
+    }
+
+
+def median_time(func, repeat, warmup, sample_seconds=0.05):
+    timer = timeit.Timer(func)
+    for _ in range(warmup):
+        func()
+    # Loop small functions enough times that each sample is well above timer noise.
+    single = min(timer.repeat(repeat=3, number=1))
+    number = max(1, int(sample_seconds / max(single, 1e-9)))
+    return statistics.median(timer.repeat(repeat=repeat, number=number)) / number
+
+
+def measure(repeat=7, warmup=3):
+    corpus = build_corpus()
+    timings = {}
+    for name, func in benchmarks(corpus).items():
+        # Re-calibrate next to every benchmark so clock drift affects both alike.
+        reference = median_time(calibrate, repeat, warmup)
+        timings[name] = median_time(func, repeat, warmup) / reference
+    return timings
+
+
+def compare_timings(baseline, current, tolerance):
+    rows = []
+    regressions = []
+    for name, value in current.items():
+        expected = baseline.get(name)
+        if expected is None:
+            rows.append(f"{name:<24} {'-':>10} {value:10.3f}  (new)")
+            continue
+        ratio = value / expected
+        status = "ok"
+        if ratio > tolerance:
+            status = "REGRESSION"
+            regressions.append(name)
+        rows.append(f"{name:<24} {expected:10.3f} {value:10.3f} {ratio:7.2f}x  {status}")
+    return rows, regressions
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Compare hot path timings against the checked-in baseline.")
+    arg_parser.add_argument("--update", action="store_true", help="record the current timings as the new baseline")
+    arg_parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE, help="allowed slowdown factor per function")
+    arg_parser.add_argument("--repeat", type=int, default=7)
+    arg_parser.add_argument("--baseline", default=BASELINE_FILE)
+    args = arg_parser.parse_args()
+
+    if not args.update and not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --update to record one")
+        return 1
+
+    current = measure(repeat=args.repeat)
+
+    if args.update:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(current, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"Wrote baseline to {args.baseline}")
+        return 0
+
+    with open(args.baseline, "r", encoding="utf-8") as f:
+        baseline = json.load(f)
+
+    rows, regressions = compare_timings(baseline, current, args.tolerance)
+    print(f"{'function':<24} {'baseline':>10} {'current':>10}  (relative to calibration loop)")
+    print("\n".join(rows))
+    if regressions:
+        print(f"Performance regression beyond {args.tolerance}x in: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,50 @@
+class BuildSummary:
+    def __init__(self):
+        self.pages = 0
+        self.pages_skipped = 0
+        self.layouts_loaded = 0
+        self.bytes_written = 0
+        self.stage_seconds = {}
+        self.profiled = False
+        self.minify_bytes_in = 0
+        self.minify_bytes_out = 0
+        self.minify_render_seconds = 0.0
+        self.minify_layout_seconds = 0.0
+        self._minified_layouts = set()
+
+    def add_stage_time(self, stage, seconds):
+        self.stage_seconds[stage] = self.stage_seconds.get(stage, 0.0) + seconds
+
+    def add_minify(self, minifier):
+        self.minify_bytes_in += minifier.bytes_in
+        self.minify_bytes_out += minifier.bytes_out
+        # Text minification runs inside the render stage, so it is reported
+        # as a share of render rather than as a stage of its own.
+        self.minify_render_seconds += minifier.seconds
+
+    def add_layout_minify(self, layout):
+        # Layouts are compiled once and shared by many pages; count them once.
+        if layout in self._minified_layouts:
+            return
+        self._minified_layouts.add(layout)
+        self.minify_layout_seconds += layout.minify_seconds
+
+    def report(self):
+        lines = [f"Built {self.pages} page(s), {self.bytes_written} bytes written"]
+        if self.profiled:
+            lines.append("  timings below include tracemalloc overhead (--memprofile)")
+        if self.pages_skipped:
+            lines.append(f"  skipped {self.pages_skipped} up-to-date page(s)")
+        if self.layouts_loaded:
+            lines.append(f"  loaded {self.layouts_loaded} layout(s)")
+        for stage, seconds in self.stage_seconds.items():
+            lines.append(f"  {stage:<10} {seconds * 1000:8.2f} ms")
+        if self.minify_bytes_in:
+            saved = self.minify_bytes_in - self.minify_bytes_out
+            percent = 100 * saved / (self.bytes_written + saved)
+            lines.append(f"  minify saved {saved} bytes ({percent:.1f}% of output)")
+            lines.append(
+                f"  minify     {self.minify_render_seconds * 1000:8.2f} ms of render, "
+                f"{self.minify_layout_seconds * 1000:.2f} ms on {len(self._minified_layouts)} layout(s)"
+            )
+        return "\n".join(lines)
@@ -16,6 +16,15 @@ class TestHTMLNode(unittest.TestCase):
         expected = ' alt="An image"'
         self.assertEqual(node.props_to_html(), expected)
 
+    def test_props_to_html_escapes_values(self):
+        node = HTMLNode(tag="img", props={"alt": 'Say "hi" & <wave>'})
+        expected = ' alt="Say &quot;hi&quot; &amp; &lt;wave&gt;"'
+        self.assertEqual(node.props_to_html(), expected)
+
+    def test_props_to_html_non_string_value(self):
+        node = LeafNode("img", "", {"width": 100})
+        self.assertEqual(node.to_html(), '<img width="100"></img>')
+
     def test_props_to_html_none(self):
         node = HTMLNode(tag="p")
         self.assertEqual(node.props_to_html(), "")
@@ -33,6 +42,14 @@ class TestLeafNode(unittest.TestCase):
         node = LeafNode(None, "Just plain text")
         self.assertEqual(node.to_html(), "Just plain text")
 
+    def test_leaf_to_html_escapes_value(self):
+        node = LeafNode("a", "< Back & forth >", {"href": "/"})
+        self.assertEqual(node.to_html(), '<a href="/">&lt; Back &amp; forth &gt;</a>')
+
+    def test_leaf_to_html_keeps_quotes_in_text(self):
+        node = LeafNode(None, '"Quoted" text')
+        self.assertEqual(node.to_html(), '"Quoted" text')
+
     def test_leaf_to_html_raises_value_error(self):
         with self.assertRaises(ValueError):
             LeafNode("p", None)
@@ -65,6 +82,28 @@ class TestParentNode(unittest.TestCase):
         with self.assertRaises(ValueError):
             ParentNode("div", None)
 
+    def test_iter_html_matches_to_html(self):
+        node = ParentNode("div", [
+            ParentNode("p", [
+                LeafNode(None, "Text before "),
+                LeafNode("a", "link", {"href": "https://example.com"}),
+            ])
+        ])
+        self.assertEqual("".join(node.iter_html()), node.to_html())
+
+    def test_iter_html_skips_filter_inside_pre(self):
+        node = ParentNode("div", [
+            LeafNode(None, "outside"),
+            ParentNode("pre", [ParentNode("code", [LeafNode(None, "inside")])]),
+        ])
+        html = "".join(node.iter_html(str.upper))
+        self.assertEqual(html, "<div>OUTSIDE<pre><code>inside</code></pre></div>")
+
+    def test_iter_html_escapes_code(self):
+        node = ParentNode("pre", [ParentNode("code", [LeafNode(None, "if a < b && c:")])])
+        html = "".join(node.iter_html())
+        self.assertEqual(html, "<pre><code>if a &lt; b &amp;&amp; c:</code></pre>")
+
 
 
 if __name__ == "__main__":
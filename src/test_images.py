@@ -0,0 +1,139 @@
+import os
+import json
+import zlib
+import struct
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+from htmlnode import LeafNode, ParentNode
+from images import ImageStage, decode_png, downscale, encode_png, read_png_size, variant_name
+
+
+def checkerboard(width, height):
+    pixels = bytearray()
+    for y in range(height):
+        for x in range(width):
+            pixels += b"\xff\x00\x00" if (x + y) % 2 == 0 else b"\x00\x00\xff"
+    return pixels
+
+
+class TestPng(unittest.TestCase):
+    def test_read_size(self):
+        data = encode_png(5, 3, 3, checkerboard(5, 3))
+        self.assertEqual(read_png_size(data), (5, 3))
+
+    def test_read_size_rejects_other_formats(self):
+        with self.assertRaises(ValueError):
+            read_png_size(b"GIF89a" + b"\x00" * 30)
+
+    def test_read_size_rejects_truncated_header(self):
+        data = encode_png(5, 3, 3, checkerboard(5, 3))
+        with self.assertRaises(ValueError):
+            read_png_size(data[:20])
+
+    def test_decode_rejects_corrupt_data(self):
+        data = bytearray(encode_png(4, 4, 3, checkerboard(4, 4)))
+        idat = data.index(b"IDAT") + 4
+        data[idat:idat + 8] = b"\xff" * 8
+        with self.assertRaises(ValueError):
+            decode_png(bytes(data))
+        with self.assertRaises(ValueError):
+            decode_png(bytes(data[:40]))
+
+        # A grayscale image relabelled as palette type, with no PLTE chunk.
+        data = bytearray(encode_png(2, 1, 1, b"\x00\x01"))
+        data[25] = 3
+        data[29:33] = struct.pack(">I", zlib.crc32(bytes(data[12:29])) & 0xFFFFFFFF)
+        with self.assertRaisesRegex(ValueError, "PLTE"):
+            decode_png(bytes(data))
+
+    def test_encode_decode_round_trip(self):
+        pixels = checkerboard(4, 4)
+        self.assertEqual(decode_png(encode_png(4, 4, 3, pixels)), (4, 4, 3, pixels))
+
+    def test_downscale_averages_boxes(self):
+        width, height, pixels = downscale(4, 4, 3, checkerboard(4, 4), 2)
+        self.assertEqual((width, height), (2, 2))
+        self.assertEqual(bytes(pixels[:3]), bytes([127, 0, 127]))
+
+    def test_variant_name(self):
+        self.assertEqual(variant_name("images/tom.png", 480), "images/tom-480w.png")
+
+
+class TestImageStage(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.static_dir = os.path.join(tmp.name, "static")
+        self.public_dir = os.path.join(tmp.name, "public")
+        self.cache_dir = os.path.join(tmp.name, "cache")
+        os.makedirs(os.path.join(self.static_dir, "images"))
+        with open(os.path.join(self.static_dir, "images", "board.png"), "wb") as f:
+            f.write(encode_png(8, 4, 3, checkerboard(8, 4)))
+        shutil.copytree(self.static_dir, self.public_dir)
+
+    def test_annotates_img_props(self):
+        stage = ImageStage(self.cache_dir, widths=(4, 16))
+        stage.prepare(self.static_dir, self.public_dir, "/site/")
+        img = LeafNode("img", "", {"src": "/images/board.png", "alt": "board"})
+        stage.annotate(ParentNode("p", [img]))
+        self.assertEqual(img.props["width"], 8)
+        self.assertEqual(img.props["height"], 4)
+        self.assertEqual(img.props["srcset"], "/site/images/board-4w.png 4w, /site/images/board.png 8w")
+        self.assertTrue(os.path.exists(os.path.join(self.public_dir, "images", "board-4w.png")))
+
+    def test_unchanged_images_are_not_rebuilt(self):
+        ImageStage(self.cache_dir, widths=(4,)).prepare(self.static_dir, self.public_dir)
+        stage = ImageStage(self.cache_dir, widths=(4,))
+        stage.prepare(self.static_dir, self.public_dir)
+        self.assertEqual(stage.variants_built, 0)
+        self.assertIn("srcset", stage.images["/images/board.png"])
+
+    def test_kept_output_does_not_get_variants_of_variants(self):
+        for _ in range(2):
+            ImageStage(self.cache_dir, widths=(2, 4)).prepare(self.static_dir, self.public_dir)
+        self.assertEqual(
+            sorted(os.listdir(os.path.join(self.public_dir, "images"))),
+            ["board-2w.png", "board-4w.png", "board.png"],
+        )
+        with open(os.path.join(self.cache_dir, "images.json"), encoding="utf-8") as f:
+            self.assertEqual(len(json.load(f)), 1)
+
+    def test_corrupt_image_is_skipped(self):
+        data = encode_png(8, 4, 3, checkerboard(8, 4))
+        with open(os.path.join(self.static_dir, "images", "broken.png"), "wb") as f:
+            f.write(data[:45])
+        with open(os.path.join(self.static_dir, "images", "stub.png"), "wb") as f:
+            f.write(data[:20])
+        stage = ImageStage(self.cache_dir, widths=(4,))
+        stage.prepare(self.static_dir, self.public_dir)
+        self.assertNotIn("srcset", stage.images["/images/broken.png"])
+        self.assertNotIn("/images/stub.png", stage.images)
+        self.assertIn("srcset", stage.images["/images/board.png"])
+
+    def test_unsupported_image_is_not_retried(self):
+        data = encode_png(8, 4, 3, checkerboard(8, 4))
+        with open(os.path.join(self.static_dir, "images", "broken.png"), "wb") as f:
+            f.write(data[:45])
+        ImageStage(self.cache_dir, widths=(4,)).prepare(self.static_dir, self.public_dir)
+        with open(os.path.join(self.cache_dir, "images.json"), encoding="utf-8") as f:
+            flags = [entry.get("unsupported", False) for entry in json.load(f).values()]
+        self.assertEqual(sorted(flags), [False, True])
+
+        stage = ImageStage(self.cache_dir, widths=(4,))
+        with mock.patch("images.ProcessPoolExecutor") as pool:
+            stage.prepare(self.static_dir, self.public_dir)
+        pool.assert_not_called()
+        self.assertEqual(stage.images["/images/broken.png"], {"width": 8, "height": 4})
+
+    def test_unknown_images_are_left_alone(self):
+        stage = ImageStage(self.cache_dir, widths=(4,))
+        stage.prepare(self.static_dir, self.public_dir)
+        img = LeafNode("img", "", {"src": "https://example.com/a.png", "alt": ""})
+        stage.annotate(img)
+        self.assertEqual(img.props, {"src": "https://example.com/a.png", "alt": ""})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+import os
+import tempfile
+import unittest
+from layouts import Layout, LayoutCache
+
+
+class TestLayout(unittest.TestCase):
+    def test_render_fills_placeholders(self):
+        layout = Layout("t.html", "<title>{{ Title }}</title><main>{{Content}}</main>")
+        self.assertEqual(
+            layout.render({"Title": "Hi", "Content": "<p>x</p>"}),
+            "<title>Hi</title><main><p>x</p></main>",
+        )
+
+    def test_unknown_placeholder_is_kept(self):
+        layout = Layout("t.html", "{{ Title }} {{ Other }}")
+        self.assertEqual(layout.render({"Title": "Hi"}), "Hi {{ Other }}")
+
+    def test_minified_layout(self):
+        layout = Layout("t.html", "<html>\n  <body>{{ Content }}</body>\n</html>\n", minify=True)
+        self.assertEqual(layout.render({"Content": "x"}), "<html> <body>x</body> </html>")
+        self.assertLess(layout.length, layout.source_length)
+
+
+class TestLayoutCache(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.root = tmp.name
+        self.default = self.write("template.html", "default {{ Content }}")
+        self.blog = self.write(os.path.join("layouts", "blog.html"), "blog {{ Content }}")
+        self.cache = LayoutCache(self.default, os.path.join(self.root, "layouts"), os.path.join(self.root, "content"))
+
+    def write(self, rel_path, content):
+        path = os.path.join(self.root, rel_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(content)
+        return path
+
+    def source(self, rel_path):
+        return os.path.join(self.root, "content", rel_path)
+
+    def test_resolve_by_section(self):
+        layouts_dir = os.path.join(self.root, "layouts")
+        self.assertEqual(
+            self.cache.resolve(self.source("blog/tom/index.md"), {}),
+            (self.blog, [os.path.join(layouts_dir, "blog", "tom.html")]),
+        )
+        self.assertEqual(self.cache.resolve(self.source("index.md"), {}), (self.default, []))
+
+    def test_resolve_from_front_matter(self):
+        self.assertEqual(self.cache.resolve(self.source("index.md"), {"layout": "blog"}), (self.blog, []))
+
+    def test_missing_front_matter_layout_raises(self):
+        with self.assertRaises(ValueError):
+            self.cache.resolve(self.source("index.md"), {"layout": "nope"})
+
+    def test_layout_loaded_once(self):
+        first = self.cache.get(self.blog)
+        for _ in range(10):
+            self.assertIs(self.cache.get(self.blog), first)
+        self.assertEqual(self.cache.loads, 1)
+
+    def test_changed_layout_is_reloaded(self):
+        self.cache.get(self.blog)
+        stat = os.stat(self.blog)
+        self.write(os.path.join("layouts", "blog.html"), "new {{ Content }}")
+        os.utime(self.blog, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        self.assertEqual(self.cache.get(self.blog).render({"Content": "x"}), "new x")
+        self.assertEqual(self.cache.loads, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
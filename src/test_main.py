@@ -0,0 +1,153 @@
+import os
+import tempfile
+import unittest
+from images import ImageStage, encode_png
+from layouts import LayoutCache
+from main import generate_page, generate_pages_recursive, paginated_path
+from manifest import BuildManifest
+
+
+class TestPaginatedPath(unittest.TestCase):
+    def test_first_page_keeps_path(self):
+        self.assertEqual(paginated_path("docs/blog/index.html", 1), "docs/blog/index.html")
+
+    def test_later_pages_are_numbered(self):
+        self.assertEqual(paginated_path("/blog/index.html", 3), "/blog/index-3.html")
+
+
+class TestGeneratePage(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.template = os.path.join(self.tmp.name, "template.html")
+        with open(self.template, "w", encoding="utf-8") as f:
+            f.write("<title>{{ Title }}</title>{{ Content }}")
+
+    def write_markdown(self, content):
+        path = os.path.join(self.tmp.name, "index.md")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(content)
+        return path
+
+    def read(self, path):
+        with open(path, encoding="utf-8") as f:
+            return f.read()
+
+    def test_single_page(self):
+        source = self.write_markdown("# Hello\n\nWorld")
+        dest = os.path.join(self.tmp.name, "out", "index.html")
+        generate_page(source, self.template, dest, "/")
+        self.assertEqual(self.read(dest), "<title>Hello</title><div><h1>Hello</h1><p>World</p></div>")
+
+    def test_title_without_space_after_hash(self):
+        source = self.write_markdown("#Hello\n\ntext")
+        dest = os.path.join(self.tmp.name, "out", "index.html")
+        generate_page(source, self.template, dest, "/")
+        self.assertEqual(self.read(dest), "<title>Hello</title><div><p>#Hello</p><p>text</p></div>")
+
+    def test_front_matter_title_and_values(self):
+        with open(self.template, "w", encoding="utf-8") as f:
+            f.write("<title>{{ Title }}</title><meta content=\"{{ description }}\">{{ Content }}")
+        source = self.write_markdown("---\ntitle: Fish & Chips\ndescription: Tasty\n---\nNo heading here")
+        dest = os.path.join(self.tmp.name, "out", "index.html")
+        layout_path, outputs = generate_page(source, self.template, dest, "/")
+        self.assertEqual(layout_path, self.template)
+        self.assertEqual(outputs, [dest])
+        self.assertEqual(
+            self.read(dest),
+            '<title>Fish &amp; Chips</title><meta content="Tasty"><div><p>No heading here</p></div>',
+        )
+
+    def test_paginated_pages_link_to_each_other(self):
+        source = self.write_markdown("# Hello\n\nfirst part\n\n## Second\n\nsecond part")
+        dest = os.path.join(self.tmp.name, "out", "index.html")
+        generate_page(source, self.template, dest, "/site/", max_page_chars=10)
+
+        first = self.read(dest)
+        second = self.read(os.path.join(self.tmp.name, "out", "index-2.html"))
+        self.assertIn('<a href="index-2.html" rel="next">Next</a>', first)
+        self.assertNotIn("Second", first)
+        self.assertIn("<title>Hello (page 2)</title>", second)
+        self.assertIn('<a href="index.html" rel="prev">Previous</a>', second)
+        self.assertIn("<span>Page 2 of 2</span>", second)
+
+    def test_title_found_after_first_page(self):
+        source = self.write_markdown("Intro paragraph that is long\n\n# Real Title\n\nbody\n\n## Two\n\nmore")
+        dest = os.path.join(self.tmp.name, "out", "index.html")
+        outputs = generate_page(source, self.template, dest, "/", max_page_chars=10)[1]
+
+        self.assertGreater(len(outputs), 1)
+        self.assertIn("<title>Real Title</title>", self.read(dest))
+        self.assertIn("<title>Real Title (page 2)</title>", self.read(outputs[1]))
+
+
+class TestIncrementalBuild(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.root = tmp.name
+        self.content = os.path.join(self.root, "content")
+        self.public = os.path.join(self.root, "public")
+        self.static = os.path.join(self.root, "static")
+        self.layouts_dir = os.path.join(self.root, "layouts")
+        self.template = self.write("template.html", "{{ Content }}")
+        self.write(os.path.join("static", "images", "a.png"), encode_png(2, 1, 1, b"\x00\xff"), "wb")
+        self.source = self.write(os.path.join("content", "blog", "tom", "index.md"), "# Tom\n\n![a](/images/a.png)")
+        self.other = self.write(os.path.join("content", "index.md"), "# Home")
+
+    def write(self, rel_path, content, mode="w"):
+        path = os.path.join(self.root, rel_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, mode) as f:
+            f.write(content)
+        return path
+
+    def bump(self, path):
+        stat = os.stat(path)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    def build(self, max_page_chars=None, images=None):
+        manifest = BuildManifest(os.path.join(self.root, "pages.json"), {})
+        generate_pages_recursive(
+            self.content, self.template, self.public, "/",
+            max_page_chars=max_page_chars, images=images, manifest=manifest,
+            layouts=LayoutCache(self.template, self.layouts_dir, self.content),
+        )
+        removed = manifest.remove_stale_outputs()
+        manifest.save()
+        # Fresh pages carry their previous manifest entry over unchanged.
+        rebuilt = {source for source, entry in manifest.pages.items() if entry is not manifest.previous.get(source)}
+        return rebuilt, removed
+
+    def test_unchanged_build_skips_everything(self):
+        self.build()
+        self.assertEqual(self.build(), (set(), []))
+
+    def test_new_section_layout_rebuilds_its_pages(self):
+        self.build()
+        self.write(os.path.join("layouts", "blog", "tom.html"), "tom {{ Content }}")
+        rebuilt, _ = self.build()
+        self.assertEqual(rebuilt, {self.source})
+
+    def test_changed_image_rebuilds_pages_using_it(self):
+        images = ImageStage(os.path.join(self.root, "cache"), widths=())
+        images.prepare(self.static, self.public)
+        self.build(images=images)
+        self.bump(os.path.join(self.static, "images", "a.png"))
+        rebuilt, _ = self.build(images=images)
+        self.assertEqual(rebuilt, {self.source})
+
+    def test_outputs_no_longer_produced_are_removed(self):
+        self.write(os.path.join("content", "blog", "tom", "index.md"), "# Tom\n\nlong text\n\n## Two\n\nmore")
+        self.build(max_page_chars=5)
+        second_page = os.path.join(self.public, "blog", "tom", "index-2.html")
+        self.assertTrue(os.path.exists(second_page))
+
+        self.write(os.path.join("content", "blog", "tom", "index.md"), "# Tom")
+        os.remove(self.other)
+        _, removed = self.build(max_page_chars=5)
+        self.assertEqual(sorted(removed), sorted([second_page, os.path.join(self.public, "index.html")]))
+
+
+if __name__ == "__main__":
+    unittest.main()
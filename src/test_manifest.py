@@ -0,0 +1,74 @@
+import os
+import tempfile
+import unittest
+from manifest import BuildManifest
+
+
+class TestBuildManifest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.root = tmp.name
+        self.path = os.path.join(self.root, "pages.json")
+        self.source = self.touch("index.md")
+        self.layout = self.touch("blog.html")
+        self.output = self.touch("index.html")
+
+    def touch(self, name):
+        path = os.path.join(self.root, name)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(name)
+        return path
+
+    def record(self, options=None):
+        manifest = BuildManifest(self.path, options or {"minify": False})
+        manifest.record(self.source, [self.source, self.layout], [self.output])
+        manifest.save()
+
+    def test_unchanged_page_is_fresh(self):
+        self.record()
+        self.assertTrue(BuildManifest(self.path, {"minify": False}).is_fresh(self.source))
+
+    def test_changed_layout_is_stale(self):
+        self.record()
+        stat = os.stat(self.layout)
+        os.utime(self.layout, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        self.assertFalse(BuildManifest(self.path, {"minify": False}).is_fresh(self.source))
+
+    def test_changed_options_are_stale(self):
+        self.record()
+        self.assertFalse(BuildManifest(self.path, {"minify": True}).is_fresh(self.source))
+
+    def test_missing_output_is_stale(self):
+        self.record()
+        os.remove(self.output)
+        self.assertFalse(BuildManifest(self.path, {"minify": False}).is_fresh(self.source))
+
+    def test_appearing_absent_path_is_stale(self):
+        missing = os.path.join(self.root, "tom.html")
+        manifest = BuildManifest(self.path, {"minify": False})
+        manifest.record(self.source, [self.source], [self.output], absent=[missing])
+        manifest.save()
+        self.assertTrue(BuildManifest(self.path, {"minify": False}).is_fresh(self.source))
+        self.touch("tom.html")
+        self.assertFalse(BuildManifest(self.path, {"minify": False}).is_fresh(self.source))
+
+    def test_outputs_no_longer_produced_are_removed(self):
+        extra = self.touch("index-2.html")
+        manifest = BuildManifest(self.path, {"minify": False})
+        manifest.record(self.source, [self.source], [self.output, extra])
+        manifest.save()
+
+        manifest = BuildManifest(self.path, {"minify": False})
+        manifest.record(self.source, [self.source], [self.output])
+        self.assertEqual(manifest.remove_stale_outputs(), [extra])
+        self.assertFalse(os.path.exists(extra))
+        self.assertTrue(os.path.exists(self.output))
+
+    def test_no_reuse_ignores_previous_build(self):
+        self.record()
+        self.assertFalse(BuildManifest(self.path, {"minify": False}, reuse=False).is_fresh(self.source))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,57 @@
+import json
+import os
+import tempfile
+import unittest
+from memprofile import MemoryProfiler, profile_stage
+from parser import markdown_to_html_node
+
+
+class TestMemoryProfiler(unittest.TestCase):
+    def setUp(self):
+        self.profiler = MemoryProfiler(top=3)
+        self.profiler.start()
+        self.addCleanup(self.profiler.stop)
+
+    def test_records_stages_per_page(self):
+        with self.profiler.stage("index.html", "parse"):
+            node = markdown_to_html_node("# Title\n\n" + "Some **bold** text\n\n" * 50)
+        with self.profiler.stage("index.html", "render"):
+            html = node.to_html()
+
+        page = self.profiler.report()["pages"]["index.html"]
+        self.assertEqual(list(page["stages"]), ["parse", "render"])
+        parse = page["stages"]["parse"]
+        self.assertGreater(parse["retained_bytes"], 0)
+        self.assertGreaterEqual(parse["peak_bytes"], parse["retained_bytes"])
+        self.assertLessEqual(len(parse["top_sites"]), 3)
+        self.assertEqual(page["peak_bytes"], max(s["peak_bytes"] for s in page["stages"].values()))
+        self.assertTrue(html)
+
+    def test_profiler_frames_are_not_reported(self):
+        for _ in range(3):
+            with self.profiler.stage("index.html", "parse"):
+                markdown_to_html_node("# Title\n\nSome text")
+        sites = [
+            site["site"]
+            for stage in self.profiler.report()["pages"]["index.html"]["stages"].values()
+            for site in stage["top_sites"]
+        ]
+        self.assertNotIn("memprofile.py", [os.path.basename(site.rsplit(":", 1)[0]) for site in sites])
+
+    def test_write_json(self):
+        with self.profiler.stage("a.html", "parse"):
+            markdown_to_html_node("# A")
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "memprofile.json")
+            self.profiler.write(path)
+            with open(path, encoding="utf-8") as f:
+                self.assertIn("a.html", json.load(f)["pages"])
+
+    def test_profile_stage_without_profiler(self):
+        with profile_stage(None, "a.html", "parse"):
+            pass
+        self.assertEqual(self.profiler.report(), {"pages": {}})
+
+
+if __name__ == "__main__":
+    unittest.main()
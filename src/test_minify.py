@@ -0,0 +1,76 @@
+import unittest
+from htmlnode import LeafNode, ParentNode
+from minify import Minifier
+from parser import markdown_to_html_node
+
+
+class TestMinifier(unittest.TestCase):
+    def test_collapses_paragraph_newlines(self):
+        node = markdown_to_html_node("first line\nsecond   line")
+        self.assertEqual(Minifier().render(node), "<div><p>first line second line</p></div>")
+
+    def test_preserves_code_block(self):
+        node = markdown_to_html_node("```\ndef f():\n    return  1\n```")
+        self.assertEqual(
+            Minifier().render(node),
+            "<div><pre><code>def f():\n    return  1</code></pre></div>",
+        )
+
+    def test_keeps_non_breaking_space(self):
+        node = ParentNode("p", [LeafNode(None, "a\u00a0\u00a0b")])
+        self.assertEqual(Minifier().render(node), "<p>a\u00a0\u00a0b</p>")
+
+    def test_template_whitespace_between_tags(self):
+        minifier = Minifier()
+        template = "<html>\n  <body>\n    <article>{{ Content }}</article>\n  </body>\n</html>\n"
+        self.assertEqual(
+            minifier.template(template),
+            "<html> <body> <article>{{ Content }}</article> </body> </html>",
+        )
+
+    def test_template_keeps_space_between_inline_siblings(self):
+        template = '<nav>\n  <a href="/">Home</a> <a href="/blog">Blog</a>\n</nav>'
+        self.assertEqual(
+            Minifier().template(template),
+            '<nav> <a href="/">Home</a> <a href="/blog">Blog</a> </nav>',
+        )
+
+    def test_template_keeps_pre_whitespace(self):
+        template = "<body>\n  <pre>line one\n    line two</pre>\n</body>"
+        self.assertEqual(
+            Minifier().template(template),
+            "<body> <pre>line one\n    line two</pre> </body>",
+        )
+
+    def test_template_keeps_raw_text_elements(self):
+        template = (
+            "<head>\n  <script>\n    // greet\n    init();\n  </script>\n"
+            "  <style>\n    p { margin: 0 }\n  </STYLE>\n</head>\n"
+            "<textarea>a\n  b</textarea>"
+        )
+        self.assertEqual(
+            Minifier().template(template),
+            "<head> <script>\n    // greet\n    init();\n  </script> "
+            "<style>\n    p { margin: 0 }\n  </STYLE> </head> "
+            "<textarea>a\n  b</textarea>",
+        )
+
+    def test_counts_saved_bytes(self):
+        minifier = Minifier()
+        minifier.text("a\n\n  b")
+        self.assertEqual(minifier.bytes_in, 6)
+        self.assertEqual(minifier.bytes_out, 3)
+
+    def test_counts_encoded_bytes(self):
+        minifier = Minifier()
+        minifier.text("caf\u00e9  \u00e9")
+        self.assertEqual(minifier.bytes_in, 9)
+        self.assertEqual(minifier.bytes_out, 8)
+
+    def test_render_matches_to_html_without_whitespace(self):
+        node = markdown_to_html_node("# Title\n\nSome **bold** text")
+        self.assertEqual(Minifier().render(node), node.to_html())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,7 +1,6 @@
 import unittest
 from textnode import TextNode, TextType
-from parser import split_nodes_delimiter, extract_markdown_images, extract_markdown_links, text_to_textnodes, markdown_to_blocks, block_to_block_type, BlockType, markdown_to_html_node
-from main import extract_title
+from parser import split_nodes_delimiter, extract_markdown_images, extract_markdown_links, text_to_textnodes, markdown_to_blocks, block_to_block_type, BlockType, markdown_to_html_node, markdown_to_document, split_markdown_pages, split_front_matter, extract_title
 
 
 class TestSplitNodesDelimiter(unittest.TestCase):
@@ -211,6 +210,60 @@ class TestMarkdownToHtmlNode(unittest.TestCase):
         self.assertEqual(ol_node.children[0].tag, "li")
         self.assertEqual(ol_node.children[1].tag, "li")
 
+class TestMarkdownToDocument(unittest.TestCase):
+    def test_title_from_first_h1(self):
+        _, metadata = markdown_to_document("Intro\n\n# Main **Title**\n\n# Second")
+        self.assertEqual(metadata.title, "Main Title")
+
+    def test_no_h1_leaves_title_empty(self):
+        _, metadata = markdown_to_document("## Subheading\n\nText")
+        self.assertIsNone(metadata.title)
+
+    def test_outline(self):
+        markdown = "# Top\n\n## Section _one_\n\ntext\n\n### Detail"
+        _, metadata = markdown_to_document(markdown)
+        self.assertEqual(metadata.outline, [(1, "Top"), (2, "Section one"), (3, "Detail")])
+
+    def test_word_count_skips_markup_and_code(self):
+        markdown = "# Two words\n\nA **bold** [link](https://x.com)\n\n- one\n- two\n\n```\nnot counted\n```"
+        _, metadata = markdown_to_document(markdown)
+        self.assertEqual(metadata.word_count, 7)
+
+    def test_node_matches_markdown_to_html_node(self):
+        markdown = "# Title\n\n> quote\n\n1. First"
+        html_node, _ = markdown_to_document(markdown)
+        self.assertEqual(html_node.to_html(), markdown_to_html_node(markdown).to_html())
+
+class TestSplitMarkdownPages(unittest.TestCase):
+    def test_short_document_is_one_page(self):
+        markdown = "# Title\n\nSome text\n\n## Section\n\nMore"
+        self.assertEqual(split_markdown_pages(markdown, 1000), [markdown])
+
+    def test_splits_only_at_headings(self):
+        markdown = "# Title\n\nfirst paragraph\n\nsecond paragraph\n\n## Next\n\nthird"
+        pages = split_markdown_pages(markdown, 10)
+        self.assertEqual(pages, [
+            "# Title\n\nfirst paragraph\n\nsecond paragraph",
+            "## Next\n\nthird",
+        ])
+
+    def test_no_headings_stays_whole(self):
+        markdown = "one paragraph\n\nanother paragraph"
+        self.assertEqual(split_markdown_pages(markdown, 5), [markdown])
+
+class TestSplitFrontMatter(unittest.TestCase):
+    def test_front_matter(self):
+        front_matter, body = split_front_matter("---\nlayout: blog\ntitle: \"A: B\"\n---\n# Heading")
+        self.assertEqual(front_matter, {"layout": "blog", "title": "A: B"})
+        self.assertEqual(body, "# Heading")
+
+    def test_without_front_matter(self):
+        self.assertEqual(split_front_matter("# Heading\n\n---\n"), ({}, "# Heading\n\n---\n"))
+
+    def test_invalid_line_raises(self):
+        with self.assertRaises(ValueError):
+            split_front_matter("---\nnot a pair\n---\nbody")
+
 class TestExtractTitle(unittest.TestCase):
     def test_basic_header(self):
         self.assertEqual(extract_title("# Hello"), "Hello")
@@ -224,6 +277,17 @@ class TestExtractTitle(unittest.TestCase):
     def test_header_no_space_after_hash(self):
         self.assertEqual(extract_title("#Title"), "Title")
 
+    def test_prefers_document_metadata(self):
+        markdown = "#Loose\n\n# Parsed"
+        _, metadata = markdown_to_document(markdown)
+        self.assertEqual(extract_title(markdown, metadata), "Parsed")
+
+    def test_falls_back_to_line_scan(self):
+        markdown = "#Hello\n\ntext"
+        _, metadata = markdown_to_document(markdown)
+        self.assertIsNone(metadata.title)
+        self.assertEqual(extract_title(markdown, metadata), "Hello")
+
     def test_no_h1_raises(self):
         with self.assertRaises(ValueError):
             extract_title("No headers here\n## Subheading")
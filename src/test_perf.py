@@ -0,0 +1,52 @@
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+from perf import BASELINE_FILE, build_corpus, compare_timings, main
+from parser import markdown_to_blocks, block_to_block_type, BlockType
+
+
+class TestCompareTimings(unittest.TestCase):
+    def test_within_tolerance(self):
+        rows, regressions = compare_timings({"to_html": 1.0}, {"to_html": 1.4}, 1.5)
+        self.assertEqual(regressions, [])
+        self.assertIn("ok", rows[0])
+
+    def test_regression_reported_per_function(self):
+        baseline = {"to_html": 1.0, "markdown_to_html_node": 2.0}
+        current = {"to_html": 1.1, "markdown_to_html_node": 10.0}
+        rows, regressions = compare_timings(baseline, current, 1.5)
+        self.assertEqual(regressions, ["markdown_to_html_node"])
+        self.assertIn("5.00x", rows[1])
+
+    def test_new_function_is_not_a_regression(self):
+        rows, regressions = compare_timings({}, {"to_html": 1.0}, 1.5)
+        self.assertEqual(regressions, [])
+        self.assertIn("(new)", rows[0])
+
+
+class TestBaseline(unittest.TestCase):
+    def test_baseline_path_is_independent_of_cwd(self):
+        self.assertTrue(os.path.isabs(BASELINE_FILE))
+        self.assertTrue(os.path.exists(BASELINE_FILE))
+
+    def test_missing_baseline_fails(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            missing = os.path.join(tmp, "baseline.json")
+            with mock.patch.object(sys, "argv", ["perf.py", "--baseline", missing]):
+                self.assertEqual(main(), 1)
+            self.assertFalse(os.path.exists(missing))
+
+
+class TestCorpus(unittest.TestCase):
+    def test_corpus_is_deterministic(self):
+        self.assertEqual(build_corpus(3), build_corpus(3))
+
+    def test_corpus_covers_every_block_type(self):
+        block_types = {block_to_block_type(block) for block in markdown_to_blocks(build_corpus(1))}
+        self.assertEqual(block_types, set(BlockType))
+
+
+if __name__ == "__main__":
+    unittest.main()
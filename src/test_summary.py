@@ -0,0 +1,31 @@
+import unittest
+from layouts import Layout
+from minify import Minifier
+from summary import BuildSummary
+
+
+class TestBuildSummary(unittest.TestCase):
+    def test_minify_is_not_a_separate_stage(self):
+        summary = BuildSummary()
+        minifier = Minifier()
+        minifier.text("a\n\nb")
+        summary.add_stage_time("render", 1.0)
+        summary.add_minify(minifier)
+        self.assertEqual(list(summary.stage_seconds), ["render"])
+        self.assertEqual(summary.minify_render_seconds, minifier.seconds)
+
+    def test_layout_minify_counted_once(self):
+        summary = BuildSummary()
+        layout = Layout("t.html", "<html>\n  <body>{{ Content }}</body>\n</html>", minify=True)
+        for _ in range(3):
+            summary.add_layout_minify(layout)
+        self.assertEqual(summary.minify_layout_seconds, layout.minify_seconds)
+
+        minifier = Minifier()
+        minifier.count(layout.source_length, layout.length)
+        summary.add_minify(minifier)
+        self.assertIn("on 1 layout(s)", summary.report())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,2 +1,8 @@
 #!/bin/bash
-python3 -m unittest discover -s src
+cd "$(dirname "$0")"
+if [ "$1" = "perf" ]; then
+    shift
+    python3 src/perf.py "$@"
+else
+    python3 -m unittest discover -s src
+fi